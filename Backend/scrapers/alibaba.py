@@ -16,10 +16,23 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(record: Dict) -> str:
+    """Serialize one output record, preferring orjson's C encoder when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(record).decode("utf-8")
+    return json.dumps(record, ensure_ascii=False)
+
+
 # Logging setup
 log_folder = Path("logs")
 log_folder.mkdir(exist_ok=True)
@@ -65,7 +78,45 @@ if invalid_fields:
     sys.exit(1)
 
 # Setup output file
-output_file = f"products_{search_keyword.replace(' ', '_')}_alibaba.json"
+output_file = f"products_{search_keyword.replace(' ', '_')}_alibaba.jsonl"
+
+COMMON_BRANDS = ("louis vuitton", "gucci", "prada", "chanel", "dior", "hermes", "burberry")
+FILLER_WORDS = frozenset(("bag", "handbag", "purse", "used"))
+
+# Precompiled patterns used on every product card
+_RE_HTML_TAG = re.compile(r'<[^>]+>')
+_RE_TITLE_CLEAN = re.compile(r'[^\w\s,()&-]')
+_RE_TITLE_SPLIT = re.compile(r'[,|/]')
+_RE_PRICE = re.compile(r'[\d,]+(?:\.\d+)?')
+_RE_PRICE_DIGITS = re.compile(r'[^\d.]')
+_RE_DIGITS = re.compile(r'(\d+)')
+_RE_ALPHA = re.compile(r'([A-Za-z]+)')
+_RE_FLOAT = re.compile(r'([\d.]+)')
+_RE_REVIEW_COUNT = re.compile(r'\((\d+)\)')
+_RE_BRAND_WORD = re.compile('|'.join(re.escape(brand) for brand in COMMON_BRANDS))
+_BRAND_RES = tuple((brand, re.compile(r'\b' + re.escape(brand) + r'\b')) for brand in COMMON_BRANDS)
+
+# Collects every card's HTML plus its images' natural sizes in one WebDriver round-trip.
+# Images are keyed by the same src/data-src/data-lazy-src attribute chain extract_images reads.
+CARD_HARVEST_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]), card => ({
+    html: card.outerHTML,
+    imgs: Array.from(card.querySelectorAll('img'), img => [
+        img.getAttribute('src') || img.getAttribute('data-src') || img.getAttribute('data-lazy-src') || '',
+        img.naturalWidth,
+        img.naturalHeight
+    ])
+}));
+"""
+
+# Optionally scrolls to the bottom and returns the card count in the same round-trip
+SCROLL_COUNT_SCRIPT = """
+const [selector, scroll] = arguments;
+if (scroll) {
+    window.scrollTo(0, document.body.scrollHeight);
+}
+return document.querySelectorAll(selector).length;
+"""
 
 class AlibabaScraper:
     def __init__(self, search_keyword: str, max_pages: int = 10, headless: bool = False, chrome_binary: Optional[str] = None, min_products: int = 100):
@@ -109,7 +160,13 @@ class AlibabaScraper:
             "video": "video, video[src], *[class*='video']",
             "captcha": "div[class*='captcha'], iframe[src*='captcha'], [id*='captcha'], div[class*='verify']"
         }
+        # Each group is tried selector by selector: earlier entries are more specific than the
+        # catch-all fallbacks at the end, so a document-order union would rank them wrongly
+        self._selector_groups = {key: tuple(group.split(", ")) for key, group in self.selectors.items()}
         self._setup_driver()
+        # Products are streamed as newline-delimited JSON while scraping, not dumped at the end;
+        # opened only once the driver is up so a failed setup leaves no handle behind
+        self.output_stream = open(self.output_dir / output_file, "w", encoding="utf-8")
 
     def _setup_driver(self):
         """Set up Selenium WebDriver with Chrome."""
@@ -146,6 +203,26 @@ class AlibabaScraper:
             logger.error(f"Failed to initialize WebDriver: {e}")
             raise
 
+    def select_first(self, soup: BeautifulSoup, key: str):
+        """Return the first element matched by the highest-priority selector in a group."""
+        for selector in self._selector_groups[key]:
+            if element := soup.select_one(selector):
+                return element
+        return None
+
+    def scroll_for_cards(self, selector: str, max_scrolls: int = 3, timeout: float = 2, poll: float = 0.25):
+        """Scroll to trigger lazy loading, stopping as soon as the card count stops growing."""
+        previous_count = self.driver.execute_script(SCROLL_COUNT_SCRIPT, selector, False)
+        for _ in range(max_scrolls):
+            deadline = time.time() + timeout
+            count = self.driver.execute_script(SCROLL_COUNT_SCRIPT, selector, True)
+            while count <= previous_count and time.time() < deadline:
+                time.sleep(poll)
+                count = self.driver.execute_script(SCROLL_COUNT_SCRIPT, selector, False)
+            if count <= previous_count:
+                break
+            previous_count = count
+
     def rotate_user_agent(self):
         """Rotate user agent to avoid detection."""
         try:
@@ -159,35 +236,30 @@ class AlibabaScraper:
         """Clean and normalize product title."""
         if not title:
             return None
-        title = re.sub(r'<[^>]+>', '', title)
-        title = re.sub(r'[^\w\s,()&-]', ' ', title)
-        parts = re.split(r'[,|/]', title)
-        parts = [part.strip() for part in parts if part.strip()]
-        seen = set()
-        cleaned_parts = []
-        for part in parts:
-            part_lower = part.lower()
-            if part_lower not in seen:
-                seen.add(part_lower)
-                cleaned_parts.append(part)
-        title = " ".join(cleaned_parts)
-        words = title.split()
-        common_brands = ["louis vuitton", "gucci", "prada", "chanel", "dior", "hermes", "burberry"]
-        brand_count = {brand: 0 for brand in common_brands}
+        title = _RE_TITLE_CLEAN.sub(' ', _RE_HTML_TAG.sub('', title))
+        # Single pass: drop repeated comma/pipe/slash parts, repeated brand mentions
+        # and filler words, lowercasing each part only once
+        seen_parts = set()
+        seen_brands = set()
         cleaned_words = []
-        for word in words:
-            word_lower = word.lower()
-            skip = False
-            for brand in common_brands:
-                if brand in word_lower:
-                    if brand_count[brand] > 0:
-                        skip = True
-                        break
-                    brand_count[brand] += 1
-            if not skip and word_lower not in ["bag", "handbag", "purse", "used"]:
-                cleaned_words.append(word)
-        cleaned_title = " ".join(cleaned_words).strip()
-        if self.search_keyword.lower() not in cleaned_title.lower():
+        cleaned_lowers = []
+        for part in _RE_TITLE_SPLIT.split(title):
+            part = part.strip()
+            part_lower = part.lower()
+            if not part or part_lower in seen_parts:
+                continue
+            seen_parts.add(part_lower)
+            for word, word_lower in zip(part.split(), part_lower.split()):
+                brands = _RE_BRAND_WORD.findall(word_lower)
+                if brands:
+                    if not seen_brands.isdisjoint(brands):
+                        continue
+                    seen_brands.update(brands)
+                if word_lower not in FILLER_WORDS:
+                    cleaned_words.append(word)
+                    cleaned_lowers.append(word_lower)
+        cleaned_title = " ".join(cleaned_words)
+        if self.search_keyword not in " ".join(cleaned_lowers):
             cleaned_title += f" {self.search_keyword.capitalize()}"
         if len(cleaned_title) > 100:
             cleaned_title = cleaned_title[:97] + "..."
@@ -196,58 +268,52 @@ class AlibabaScraper:
     def extract_price(self, soup: BeautifulSoup, title: str) -> Dict[str, Optional[str]]:
         """Extract currency and exact price."""
         try:
-            for selector in self.selectors["price"].split(", "):
-                if price_el := soup.select_one(selector):
-                    raw_price = price_el.get_text(strip=True)
-                    if "Contact Supplier" in raw_price or "Negotiable" in raw_price:
-                        return {"currency": None, "exact_price": "Ask Price"}
-                    currency = None
-                    currency_symbols = ["$", "€", "¥", "£", "US$", "CNY", "₹"]
-                    for symbol in currency_symbols:
-                        if symbol in raw_price:
-                            currency = symbol
-                            break
-                    price_pattern = r'[\d,]+(?:\.\d+)?'
-                    price_matches = re.findall(price_pattern, raw_price)
-                    price_values = [re.sub(r'[^\d.]', '', p) for p in price_matches]
-                    if price_values:
-                        return {"currency": currency, "exact_price": price_values[0]}
-                    break
+            if price_el := self.select_first(soup, "price"):
+                raw_price = price_el.get_text(strip=True)
+                if "Contact Supplier" in raw_price or "Negotiable" in raw_price:
+                    return {"currency": None, "exact_price": "Ask Price"}
+                currency = None
+                currency_symbols = ["$", "€", "¥", "£", "US$", "CNY", "₹"]
+                for symbol in currency_symbols:
+                    if symbol in raw_price:
+                        currency = symbol
+                        break
+                price_matches = _RE_PRICE.findall(raw_price)
+                price_values = [_RE_PRICE_DIGITS.sub('', p) for p in price_matches]
+                if price_values:
+                    return {"currency": currency, "exact_price": price_values[0]}
             logger.warning(f"No price found for {title}")
             return {"currency": None, "exact_price": None}
         except Exception as e:
             logger.error(f"Error extracting price for {title}: {e}")
             return {"currency": None, "exact_price": None}
 
-    def extract_images(self, soup: BeautifulSoup, card_elem, title: str) -> Dict[str, Optional[any]]:
-        """Extract image_url, images, and dimensions."""
+    def extract_images(self, soup: BeautifulSoup, image_sizes: Dict[str, tuple], title: str) -> Dict[str, Optional[any]]:
+        """Extract image_url, images, and dimensions using pre-harvested natural image sizes."""
         try:
             images = []
             image_url = None
             dimensions = None
-            for selector in self.selectors["image"].split(", "):
+            for selector in self._selector_groups["image"]:
                 img_elements = soup.select(selector)
                 if not img_elements:
                     continue
                 for idx, img in enumerate(img_elements):
-                    src = img.get("src", "") or img.get("data-src", "") or img.get("data-lazy-src", "")
-                    if not src or any(x in src.lower() for x in ['placeholder', 'default', '.svg', 'noimage']):
+                    raw_src = img.get("src", "") or img.get("data-src", "") or img.get("data-lazy-src", "")
+                    if not raw_src or any(x in raw_src.lower() for x in ['placeholder', 'default', '.svg', 'noimage']):
                         continue
-                    if src.startswith('//'):
-                        src = 'https:' + src
-                    elif not src.startswith(('http://', 'https://')):
-                        src = urljoin(self.base_url, src)
+                    if raw_src.startswith('//'):
+                        src = 'https:' + raw_src
+                    elif not raw_src.startswith(('http://', 'https://')):
+                        src = urljoin(self.base_url, raw_src)
+                    else:
+                        src = raw_src
                     if idx == 0:
                         image_url = src
-                        width = height = "Unknown"
-                        try:
-                            img_elem = card_elem.find_element(By.CSS_SELECTOR, selector)
-                            width = self.driver.execute_script("return arguments[0].naturalWidth", img_elem) or img.get("width", "Unknown")
-                            height = self.driver.execute_script("return arguments[0].naturalHeight", img_elem) or img.get("height", "Unknown")
-                            dimensions = f"{width}x{height}"
-                        except Exception as e:
-                            logger.debug(f"Error getting image dimensions for {title}: {e}")
-                            dimensions = f"{img.get('width', 'Unknown')}x{img.get('height', 'Unknown')}"
+                        natural_width, natural_height = image_sizes.get(raw_src, (0, 0))
+                        width = natural_width or img.get("width", "Unknown")
+                        height = natural_height or img.get("height", "Unknown")
+                        dimensions = f"{width}x{height}"
                     images.append(src)
                 if images:
                     break
@@ -263,9 +329,8 @@ class AlibabaScraper:
     def extract_description(self, soup: BeautifulSoup, title: str) -> Optional[str]:
         """Extract product description."""
         try:
-            for selector in self.selectors["detail_description"].split(", "):
-                if desc := soup.select_one(selector):
-                    return desc.get_text(strip=True)
+            if desc := self.select_first(soup, "detail_description"):
+                return desc.get_text(strip=True)
             return None
         except Exception as e:
             logger.error(f"Error extracting description for {title}: {e}")
@@ -274,18 +339,14 @@ class AlibabaScraper:
     def extract_min_order(self, soup: BeautifulSoup, title: str) -> Optional[str]:
         """Extract minimum order quantity and unit."""
         try:
-            for selector in self.selectors["discount"].split(", "):
-                if moq_el := soup.select_one(selector):
-                    text = moq_el.get_text(strip=True)
-                    qty_pattern = r'(\d+)'
-                    qty_match = re.search(qty_pattern, text)
-                    qty = qty_match.group(1) if qty_match else None
-                    unit_pattern = r'([A-Za-z]+)'
-                    unit_match = re.search(unit_pattern, text)
-                    unit = unit_match.group(1) if unit_match else None
-                    if qty and unit:
-                        return f"{qty} {unit}"
-                    return None
+            if moq_el := self.select_first(soup, "discount"):
+                text = moq_el.get_text(strip=True)
+                qty_match = _RE_DIGITS.search(text)
+                qty = qty_match.group(1) if qty_match else None
+                unit_match = _RE_ALPHA.search(text)
+                unit = unit_match.group(1) if unit_match else None
+                if qty and unit:
+                    return f"{qty} {unit}"
             return None
         except Exception as e:
             logger.error(f"Error extracting min order for {title}: {e}")
@@ -294,9 +355,8 @@ class AlibabaScraper:
     def extract_supplier(self, soup: BeautifulSoup, title: str) -> Optional[str]:
         """Extract supplier name."""
         try:
-            for selector in self.selectors["supplier"].split(", "):
-                if elem := soup.select_one(selector):
-                    return elem.get_text(strip=True)
+            if elem := self.select_first(soup, "supplier"):
+                return elem.get_text(strip=True)
             return None
         except Exception as e:
             logger.error(f"Error extracting supplier for {title}: {e}")
@@ -305,9 +365,8 @@ class AlibabaScraper:
     def extract_origin(self, soup: BeautifulSoup, title: str) -> Optional[str]:
         """Extract product origin."""
         try:
-            for selector in self.selectors["origin"].split(", "):
-                if origin_el := soup.select_one(selector):
-                    return origin_el.get_text(strip=True)
+            if origin_el := self.select_first(soup, "origin"):
+                return origin_el.get_text(strip=True)
             return None
         except Exception as e:
             logger.error(f"Error extracting origin for {title}: {e}")
@@ -317,20 +376,17 @@ class AlibabaScraper:
         """Extract rating and review count."""
         feedback = {"rating": None, "review": None}
         try:
-            for selector in self.selectors["feedback"].split(", "):
-                if rating_el := soup.select_one(selector):
-                    rating_text = rating_el.get_text(strip=True)
-                    rating_match = re.search(r'([\d.]+)', rating_text)
-                    if rating_match:
-                        feedback["rating"] = rating_match.group(1)
-                        break
-            for selector in self.selectors["feedback"].split(", "):
-                if review_el := soup.select_one(selector):
-                    review_text = review_el.get_text(strip=True)
-                    review_match = re.search(r'\((\d+)\)', review_text)
-                    if review_match:
-                        feedback["review"] = review_match.group(1)
-                        break
+            # One pass over the group serves both lookups; each takes the first selector whose match fits
+            for selector in self._selector_groups["feedback"]:
+                if not (feedback_el := soup.select_one(selector)):
+                    continue
+                feedback_text = feedback_el.get_text(strip=True)
+                if not feedback["rating"] and (rating_match := _RE_FLOAT.search(feedback_text)):
+                    feedback["rating"] = rating_match.group(1)
+                if not feedback["review"] and (review_match := _RE_REVIEW_COUNT.search(feedback_text)):
+                    feedback["review"] = review_match.group(1)
+                if feedback["rating"] and feedback["review"]:
+                    break
             return feedback
         except Exception as e:
             logger.error(f"Error extracting feedback for {title}: {e}")
@@ -340,9 +396,8 @@ class AlibabaScraper:
         """Extract brand from title."""
         try:
             title_lower = title.lower()
-            common_brands = ["louis vuitton", "gucci", "prada", "chanel", "dior", "hermes", "burberry"]
-            for brand in common_brands:
-                if re.search(r'\b' + re.escape(brand) + r'\b', title_lower):
+            for brand, brand_re in _BRAND_RES:
+                if brand_re.search(title_lower):
                     return brand.title()
             return None
         except Exception as e:
@@ -352,9 +407,8 @@ class AlibabaScraper:
     def extract_discount(self, soup: BeautifulSoup, title: str) -> Optional[str]:
         """Extract discount information."""
         try:
-            for selector in self.selectors["discount"].split(", "):
-                if discount_el := soup.select_one(selector):
-                    return discount_el.get_text(strip=True)
+            if discount_el := self.select_first(soup, "discount"):
+                return discount_el.get_text(strip=True)
             return None
         except Exception as e:
             logger.error(f"Error extracting discount for {title}: {e}")
@@ -364,10 +418,9 @@ class AlibabaScraper:
         """Extract video URLs."""
         try:
             videos = []
-            for selector in self.selectors["video"].split(", "):
-                for video_el in soup.find_all("video"):
-                    if src := video_el.get("src"):
-                        videos.append(src)
+            for video_el in soup.find_all("video"):
+                if src := video_el.get("src"):
+                    videos.append(src)
             return videos if videos else None
         except Exception as e:
             logger.error(f"Error extracting videos for {title}: {e}")
@@ -377,7 +430,7 @@ class AlibabaScraper:
         """Extract product specifications."""
         specs = {}
         try:
-            for selector in self.selectors["detail_specs"].split(", "):
+            for selector in self._selector_groups["detail_specs"]:
                 for spec_elem in soup.select(selector):
                     if selector == ".attribute-list":
                         for item in spec_elem.select(".attribute-item"):
@@ -442,7 +495,7 @@ class AlibabaScraper:
             detail_data["specifications"] = self.extract_specifications(detail_soup, title)
             detail_data["origin"] = self.extract_origin(detail_soup, title)
             valid_extensions = ('.jpg', '.jpeg', '.png', '.webp')
-            for selector in self.selectors["detail_images"].split(", "):
+            for selector in self._selector_groups["detail_images"]:
                 for img in detail_soup.select(selector):
                     src = img.get("src", "") or img.get("data-src", "") or img.get("data-lazy-src", "")
                     if not src or any(x in src.lower() for x in ['placeholder', 'default', '.svg', 'noimage']):
@@ -481,7 +534,7 @@ class AlibabaScraper:
                     logger.error(f"Failed anti-bot checks on page {page}")
                     continue
                 working_selector = None
-                for selector in self.selectors["product_card"].split(", "):
+                for selector in self._selector_groups["product_card"]:
                     try:
                         self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)))
                         working_selector = selector
@@ -492,40 +545,34 @@ class AlibabaScraper:
                 if not working_selector:
                     logger.error(f"No products found on page {page}")
                     continue
-                previous_count = 0
-                for _ in range(3):
-                    cards = self.driver.find_elements(By.CSS_SELECTOR, working_selector)
-                    if len(cards) == previous_count:
-                        break
-                    previous_count = len(cards)
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(random.uniform(1, 2))
+                self.scroll_for_cards(working_selector)
                 product_list = []
-                idx = 0
-                while True:
+                cards = self.driver.execute_script(CARD_HARVEST_SCRIPT, working_selector)
+                for idx, card in enumerate(cards):
                     if len(self.scraped_data) + len(product_list) >= self.min_products:
                         break
-                    cards = self.driver.find_elements(By.CSS_SELECTOR, working_selector)
-                    if idx >= len(cards):
-                        break
-                    retries = 3
-                    card_elem = None
-                    while retries > 0:
-                        try:
-                            card_elem = cards[idx]
-                            break
-                        except (StaleElementReferenceException, IndexError):
-                            retries -= 1
-                            time.sleep(1)
-                            cards = self.driver.find_elements(By.CSS_SELECTOR, working_selector)
-                    if not card_elem:
-                        logger.warning(f"Failed to retrieve card {idx} after retries")
-                        self.skipped_products.append({"idx": idx + 1, "page": page, "reason": "Stale element after retries"})
-                        idx += 1
+                    card_soup = BeautifulSoup(card["html"], "html.parser")
+                    title = None
+                    if title_el := self.select_first(card_soup, "title"):
+                        title = title_el.get_text(strip=True)
+                    if not title:
+                        logger.warning(f"No title found for card {idx}")
+                        self.skipped_products.append({"idx": idx + 1, "page": page, "reason": "No title"})
+                        continue
+                    title = self.clean_title(title)
+                    # search_keyword is lowercased once in __init__
+                    if self.search_keyword not in title.lower():
+                        logger.info(f"Skipping non-matching product: {title}")
+                        self.skipped_products.append({
+                            "idx": idx + 1,
+                            "page": page,
+                            "title": title,
+                            "reason": f"Does not match search keyword: {self.search_keyword}"
+                        })
                         continue
                     product_data = {
                         "url": None,
-                        "title": None,
+                        "title": title,
                         "currency": None,
                         "exact_price": None,
                         "description": None,
@@ -542,37 +589,8 @@ class AlibabaScraper:
                         "brand_name": None,
                         "specifications": {}
                     }
-                    try:
-                        card_html = card_elem.get_attribute("outerHTML")
-                        card_soup = BeautifulSoup(card_html, "html.parser")
-                    except StaleElementReferenceException:
-                        logger.warning(f"Stale element for card {idx}. Skipping.")
-                        self.skipped_products.append({"idx": idx + 1, "page": page, "reason": "Stale element during HTML retrieval"})
-                        idx += 1
-                        continue
-                    title = None
-                    for selector in self.selectors["title"].split(", "):
-                        if title_el := card_soup.select_one(selector):
-                            title = title_el.get_text(strip=True)
-                            break
-                    if not title:
-                        logger.warning(f"No title found for card {idx}")
-                        self.skipped_products.append({"idx": idx + 1, "page": page, "reason": "No title"})
-                        idx += 1
-                        continue
-                    product_data["title"] = self.clean_title(title)
-                    if self.search_keyword.lower() not in product_data["title"].lower():
-                        logger.info(f"Skipping non-matching product: {product_data['title']}")
-                        self.skipped_products.append({
-                            "idx": idx + 1,
-                            "page": page,
-                            "title": product_data["title"],
-                            "reason": f"Does not match search keyword: {self.search_keyword}"
-                        })
-                        idx += 1
-                        continue
                     product_url = None
-                    for selector in self.selectors["product_link"].split(", "):
+                    for selector in self._selector_groups["product_link"]:
                         if a_tag := card_soup.select_one(selector):
                             product_url = a_tag.get("href", None)
                             break
@@ -584,7 +602,6 @@ class AlibabaScraper:
                             "title": product_data["title"],
                             "reason": "No URL"
                         })
-                        idx += 1
                         continue
                     if product_url.startswith('//'):
                         product_url = f"https:{product_url}"
@@ -599,14 +616,14 @@ class AlibabaScraper:
                     product_data["feedback"] = self.extract_feedback(card_soup, product_data["title"])
                     product_data["discount_information"] = self.extract_discount(card_soup, product_data["title"])
                     product_data["brand_name"] = self.extract_brand(product_data["title"])
-                    image_data = self.extract_images(card_soup, card_elem, product_data["title"])
+                    image_sizes = {src: (width, height) for src, width, height in card["imgs"]}
+                    image_data = self.extract_images(card_soup, image_sizes, product_data["title"])
                     product_data.update(image_data)
                     if image_data["dimensions"]:
                         product_data["specifications"]["Dimensions"] = image_data["dimensions"]
                     product_data["dimensions"] = None  # Remove separate dimensions field
                     product_list.append(product_data)
                     logger.info(f"Collected listing data for product {idx + 1}/{len(cards)} on page {page}: {product_data['title']}")
-                    idx += 1
                 for product_data in product_list:
                     if len(self.scraped_data) >= self.min_products:
                         break
@@ -622,6 +639,7 @@ class AlibabaScraper:
                                 product_data["image_url"] = product_data["images"][0]
                         if product_data["title"] and product_data["url"]:
                             self.scraped_data.append(product_data)
+                            self.write_record(product_data)
                             logger.info(f"Scraped product on page {page}: {product_data['title']}")
                         else:
                             self.skipped_products.append({
@@ -643,7 +661,7 @@ class AlibabaScraper:
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                     time.sleep(1)
                     next_button = None
-                    for selector in self.selectors["next_page"].split(", "):
+                    for selector in self._selector_groups["next_page"]:
                         try:
                             next_button = self.driver.find_element(By.CSS_SELECTOR, selector)
                             if next_button.is_displayed() and next_button.is_enabled():
@@ -666,4 +684,31 @@ class AlibabaScraper:
         finally:
             self.save_results()
             self.close()
-        return self.scraped_data
\ No newline at end of file
+        return self.scraped_data
+
+    def write_record(self, record: Dict):
+        """Append one JSON record to the output stream."""
+        self.output_stream.write(_dumps(record))
+        self.output_stream.write("\n")
+
+    def save_results(self):
+        """Flush the output stream; every line in it is a product record."""
+        try:
+            self.output_stream.flush()
+            logger.info(
+                f"Saved {len(self.scraped_data)} products to {self.output_dir / output_file} "
+                f"for '{self.search_keyword}' ({len(self.skipped_products)} skipped)"
+            )
+        except Exception as e:
+            logger.error(f"Error saving results: {e}")
+
+    def close(self):
+        """Close the output stream and the WebDriver."""
+        if not self.output_stream.closed:
+            self.output_stream.close()
+        if self.driver:
+            try:
+                self.driver.quit()
+            except WebDriverException as e:
+                logger.warning(f"Error closing WebDriver: {e}")
+            self.driver = None
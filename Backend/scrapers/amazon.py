@@ -45,6 +45,9 @@ FIELD_MAPPING = {
     'brand': 'brand_name'
 }
 
+# Shared encoder for the newline-delimited JSON messages sent to Node.js
+_encode_message = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
 
 class AmazonScraper:
     def __init__(self, query, fields, max_items, job_id):
@@ -54,6 +57,7 @@ class AmazonScraper:
         self.job_id = job_id
         self.scraped_count = 0
         self.browser = None
+        self._out = sys.stdout.buffer
         
     def _map_fields(self, fields):
         """Map frontend field names to backend field names"""
@@ -65,14 +69,19 @@ class AmazonScraper:
         # Always include url and website_name
         return list(set(['url', 'website_name'] + mapped))
     
+    def _write_message(self, message):
+        """Write one JSON message line to the buffered stdout stream"""
+        self._out.write(_encode_message(message).encode('utf-8') + b'\n')
+    
     def send_progress(self, scraped, total):
-        """Send progress update to Node.js backend"""
+        """Send progress update to Node.js backend, flushing any buffered items"""
         progress_data = {
             "type": "progress",
             "scraped": scraped,
             "total": total
         }
-        print(json.dumps(progress_data), flush=True)
+        self._write_message(progress_data)
+        self._out.flush()
     
     def send_item(self, item, url, index):
         """Send scraped item to Node.js backend"""
@@ -82,7 +91,7 @@ class AmazonScraper:
             "url": url,
             "index": index
         }
-        print(json.dumps(item_data), flush=True)
+        self._write_message(item_data)
     
     def send_error(self, message):
         """Send error message to stderr"""
@@ -11,6 +11,7 @@ import time
 import random
 import logging
 import argparse
+import functools
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -47,15 +48,47 @@ FIELD_MAPPING = {
     'rating': 'feedback'
 }
 
+# Shared encoder for the newline-delimited JSON messages sent to Node.js
+_encode_message = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+# Fields that can only be read from the product detail page
+DETAIL_FIELDS = frozenset([
+    'min_order', 'supplier', 'origin', 'feedback', 'specifications', 'images', 'videos', 'brand_name'
+])
+
+WINDOW_SIZE = "--window-size=1920,1080"
+
+# Only markup is scraped; image URLs stay readable from src attributes without fetching the bytes
+BLOCKED_RESOURCE_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.webp', '*.gif', '*.svg',
+    '*.css', '*.woff', '*.woff2', '*.ttf'
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _geckodriver_path():
+    """Resolve the geckodriver binary once per process"""
+    return GeckoDriverManager().install()
+
+
+@functools.lru_cache(maxsize=None)
+def _chromedriver_path():
+    """Resolve the chromedriver binary once per process"""
+    return ChromeDriverManager().install()
+
 
 class DHgateScraper:
     def __init__(self, query, fields, max_items, job_id):
         self.query = query
         self.fields = self._map_fields(fields)
+        # Field membership is fixed for the run; resolve the compound checks once
+        self._need_price = 'currency' in self.fields or 'exact_price' in self.fields
+        self._need_details = not DETAIL_FIELDS.isdisjoint(self.fields)
         self.max_items = max_items
         self.job_id = job_id
         self.scraped_count = 0
         self.browser = None
+        self._out = sys.stdout.buffer
         
     def _map_fields(self, fields):
         """Map frontend field names to backend field names"""
@@ -65,16 +98,21 @@ class DHgateScraper:
             mapped_field = FIELD_MAPPING.get(field, field)
             mapped.append(mapped_field)
         # Always include url and website_name
-        return list(set(['url', 'website_name'] + mapped))
+        return frozenset(['url', 'website_name'] + mapped)
+    
+    def _write_message(self, message):
+        """Write one JSON message line to the buffered stdout stream"""
+        self._out.write(_encode_message(message).encode('utf-8') + b'\n')
     
     def send_progress(self, scraped, total):
-        """Send progress update to Node.js backend"""
+        """Send progress update to Node.js backend, flushing any buffered items"""
         progress_data = {
             "type": "progress",
             "scraped": scraped,
             "total": total
         }
-        print(json.dumps(progress_data), flush=True)
+        self._write_message(progress_data)
+        self._out.flush()
     
     def send_item(self, item, url, index):
         """Send scraped item to Node.js backend"""
@@ -84,7 +122,7 @@ class DHgateScraper:
             "url": url,
             "index": index
         }
-        print(json.dumps(item_data), flush=True)
+        self._write_message(item_data)
     
     def send_error(self, message):
         """Send error message to stderr"""
@@ -99,6 +137,9 @@ class DHgateScraper:
         # Try Firefox first
         firefox_options = webdriver.FirefoxOptions()
         firefox_options.add_argument("--headless")
+        firefox_options.add_argument("--width=1920")
+        firefox_options.add_argument("--height=1080")
+        firefox_options.set_preference("permissions.default.image", 2)
         firefox_options.add_argument("--ignore-certificate-errors")
         firefox_options.add_argument("--log-level=3")
         firefox_options.add_argument(
@@ -108,11 +149,10 @@ class DHgateScraper:
         
         try:
             self.browser = webdriver.Firefox(
-                service=webdriver.firefox.service.Service(GeckoDriverManager().install()),
+                service=webdriver.firefox.service.Service(_geckodriver_path()),
                 options=firefox_options
             )
             self.browser.set_page_load_timeout(30)
-            self.browser.maximize_window()
             logger.info("Firefox browser initialized successfully")
             return
         except WebDriverException:
@@ -121,6 +161,11 @@ class DHgateScraper:
         # Fallback to Chrome
         chrome_options = webdriver.ChromeOptions()
         chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument(WINDOW_SIZE)
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2
+        })
         chrome_options.add_argument("--ignore-certificate-errors")
         chrome_options.add_argument("--log-level=3")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
@@ -133,11 +178,12 @@ class DHgateScraper:
         
         try:
             self.browser = webdriver.Chrome(
-                service=webdriver.chrome.service.Service(ChromeDriverManager().install()),
+                service=webdriver.chrome.service.Service(_chromedriver_path()),
                 options=chrome_options
             )
+            self.browser.execute_cdp_cmd('Network.enable', {})
+            self.browser.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_URLS})
             self.browser.set_page_load_timeout(30)
-            self.browser.maximize_window()
             logger.info("Chrome browser initialized successfully")
         except WebDriverException as e:
             raise Exception(f"Error initializing browser (Firefox and Chrome failed): {str(e)}")
@@ -172,24 +218,12 @@ class DHgateScraper:
         
         return {'currency': currency, 'exact_price': None}
     
-    def retry_extraction(self, func, attempts=3, delay=1, default=None):
-        """Retry extraction with attempts"""
-        for i in range(attempts):
-            try:
-                result = func()
-                if result:
-                    return result
-            except Exception as e:
-                if i < attempts - 1:
-                    time.sleep(delay)
-        return default
-    
     def filter_product_data(self, product_data):
         """Filter product data to include only desired fields"""
         return {field: product_data[field] for field in self.fields if field in product_data}
     
     def extract_product_card(self, card, index):
-        """Extract data from a product card on search page"""
+        """Extract data from a parsed product card on search page"""
         product = {
             "url": None,
             "title": None,
@@ -208,8 +242,6 @@ class DHgateScraper:
         }
         
         try:
-            soup = BeautifulSoup(card.get_attribute('outerHTML'), 'html.parser')
-            
             # Title and URL
             title_selectors = [
                 'div.gallery-pro-name a',
@@ -219,15 +251,13 @@ class DHgateScraper:
             ]
             title_el = None
             for selector in title_selectors:
-                title_el = soup.select_one(selector)
+                title_el = card.select_one(selector)
                 if title_el:
                     break
             
             if title_el:
                 if 'title' in self.fields:
-                    product['title'] = self.retry_extraction(
-                        lambda: self.clean_text(title_el.get('title') or title_el.get_text(strip=True))
-                    )
+                    product['title'] = self.clean_text(title_el.get('title') or title_el.get_text(strip=True))
                 if 'url' in self.fields:
                     href = title_el.get('href', '')
                     product['url'] = href if href.startswith('http') else f"https://www.dhgate.com{href}"
@@ -236,7 +266,7 @@ class DHgateScraper:
                 return None
             
             # Price
-            if 'currency' in self.fields or 'exact_price' in self.fields:
+            if self._need_price:
                 price_selectors = [
                     '.gallery-pro-price',
                     '[class*="price"]',
@@ -245,11 +275,11 @@ class DHgateScraper:
                 ]
                 price_el = None
                 for selector in price_selectors:
-                    price_el = soup.select_one(selector)
+                    price_el = card.select_one(selector)
                     if price_el:
                         break
                 if price_el:
-                    price_text = self.retry_extraction(lambda: price_el.get_text(strip=True))
+                    price_text = price_el.get_text(strip=True)
                     price_info = self.parse_price(price_text)
                     product.update(price_info)
             
@@ -258,13 +288,11 @@ class DHgateScraper:
                 discount_selectors = ['.discount', '.promo-info', 'span[class*="discount"]']
                 discount_el = None
                 for selector in discount_selectors:
-                    discount_el = soup.select_one(selector)
+                    discount_el = card.select_one(selector)
                     if discount_el:
                         break
-                product['discount_information'] = self.retry_extraction(
-                    lambda: self.clean_text(discount_el.get_text(strip=True)),
-                    default=None
-                )
+                if discount_el:
+                    product['discount_information'] = self.clean_text(discount_el.get_text(strip=True))
             
             return product
             
@@ -291,10 +319,8 @@ class DHgateScraper:
                     moq_el = page_soup.select_one(selector)
                     if moq_el:
                         break
-                product['min_order'] = self.retry_extraction(
-                    lambda: self.clean_text(moq_el.get_text(strip=True)),
-                    default="1 unit"
-                )
+                if moq_el:
+                    product['min_order'] = self.clean_text(moq_el.get_text(strip=True)) or "1 unit"
             
             # Supplier
             if 'supplier' in self.fields:
@@ -309,26 +335,20 @@ class DHgateScraper:
                     supplier_el = page_soup.select_one(selector)
                     if supplier_el:
                         break
-                product['supplier'] = self.retry_extraction(
-                    lambda: self.clean_text(supplier_el.get_text(strip=True)),
-                    default=None
-                )
+                if supplier_el:
+                    product['supplier'] = self.clean_text(supplier_el.get_text(strip=True))
             
             # Origin
             if 'origin' in self.fields:
                 specs_container = page_soup.find('div', class_=re.compile(r'prodSpecifications_showLayer'))
                 if specs_container:
                     for li in specs_container.select('ul li'):
-                        key_text = self.retry_extraction(
-                            lambda: self.clean_text(li.find('span').get_text(strip=True) if li.find('span') else ''),
-                            default=''
-                        )
+                        key_span = li.find('span')
+                        key_text = self.clean_text(key_span.get_text(strip=True)) if key_span else None
                         if key_text and 'origin' in key_text.lower():
                             value_div = li.find('div', class_=re.compile(r'prodSpecifications_deswrap'))
-                            product['origin'] = self.retry_extraction(
-                                lambda: self.clean_text(value_div.get_text(strip=True)),
-                                default=None
-                            )
+                            if value_div:
+                                product['origin'] = self.clean_text(value_div.get_text(strip=True))
                             break
             
             # Feedback
@@ -340,7 +360,7 @@ class DHgateScraper:
                     if review_el:
                         break
                 if review_el:
-                    review_text = self.retry_extraction(lambda: review_el.get_text(strip=True))
+                    review_text = review_el.get_text(strip=True)
                     review_match = re.search(r'\d+', review_text)
                     product['feedback']['review'] = review_match.group(0) if review_match else None
                 
@@ -351,7 +371,7 @@ class DHgateScraper:
                     if rating_el:
                         break
                 if rating_el:
-                    rating_text = self.retry_extraction(lambda: rating_el.get_text(strip=True))
+                    rating_text = rating_el.get_text(strip=True)
                     if re.match(r'^\d+\.\d+', rating_text):
                         product['feedback']['rating'] = rating_text
             
@@ -364,14 +384,8 @@ class DHgateScraper:
                         key_span = li.find('span')
                         value_div = li.find('div', class_=re.compile(r'prodSpecifications_deswrap'))
                         if key_span and value_div:
-                            key = self.retry_extraction(
-                                lambda: self.clean_text(key_span.get_text(strip=True).replace(':', '')),
-                                default=None
-                            )
-                            value = self.retry_extraction(
-                                lambda: self.clean_text(value_div.get_text(strip=True)),
-                                default=None
-                            )
+                            key = self.clean_text(key_span.get_text(strip=True).replace(':', ''))
+                            value = self.clean_text(value_div.get_text(strip=True))
                             if key and value:
                                 specs[key] = value
                 product['specifications'] = specs
@@ -389,12 +403,9 @@ class DHgateScraper:
                     if img_els:
                         break
                 product['images'] = [
-                    self.retry_extraction(
-                        lambda: (img.get('data-zoom-image') or img.get('src', '')).replace('100x100', ''),
-                        default=''
-                    )
-                    for img in img_els
-                    if '100x100' not in (img.get('data-zoom-image') or img.get('src', ''))
+                    src
+                    for src in ((img.get('data-zoom-image') or img.get('src', '')) for img in img_els)
+                    if '100x100' not in src
                 ]
                 product['images'] = [
                     img if img.startswith('http') else f"https:{img}"
@@ -454,17 +465,15 @@ class DHgateScraper:
                 '.product-item',
                 'div[class*="product-list"] > div'
             ]
+            # Snapshot the listing once; cards are parsed locally and stay valid
+            # while the browser navigates to detail pages
+            page_soup = BeautifulSoup(self.browser.page_source, 'lxml')
             product_cards = None
             for selector in product_cards_selectors:
-                try:
-                    product_cards = WebDriverWait(self.browser, 10).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                    )
-                    if product_cards:
-                        logger.info(f"Found {len(product_cards)} products with selector: {selector}")
-                        break
-                except TimeoutException:
-                    continue
+                product_cards = page_soup.select(selector)
+                if product_cards:
+                    logger.info(f"Found {len(product_cards)} products with selector: {selector}")
+                    break
             
             if not product_cards:
                 logger.warning(f"No products found on page {page_num}")
@@ -479,13 +488,12 @@ class DHgateScraper:
                     continue
                 
                 # Visit product page if detailed fields needed
-                if any(field in self.fields for field in [
-                    'min_order', 'supplier', 'origin', 'feedback', 'specifications', 'images', 'videos', 'brand_name'
-                ]):
+                if self._need_details:
                     self.scrape_product_page_details(product)
+                    # Jitter only between detail-page navigations, not between in-memory card parses
+                    time.sleep(random.uniform(0.3, 0.7))
                 
                 products.append(self.filter_product_data(product))
-                time.sleep(random.uniform(0.3, 0.7))
             
             return products
             
@@ -44,6 +44,13 @@ FIELD_MAPPING = {
     'specs': 'specifications'
 }
 
+# Shared encoder for the newline-delimited JSON messages sent to Node.js
+_encode_message = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+# Text that marks a captcha/bot-check page, including g-recaptcha widgets and challenge
+# forms in the markup; matched case-insensitively in one scan
+_CAPTCHA_RE = re.compile(r'captcha|challenge-form|verify you are not a robot|please verify', re.IGNORECASE)
+
 
 class FlipkartScraper:
     def __init__(self, query, fields, max_items, job_id):
@@ -53,6 +60,7 @@ class FlipkartScraper:
         self.job_id = job_id
         self.scraped_count = 0
         self.browser = None
+        self._out = sys.stdout.buffer
         
     def _map_fields(self, fields):
         """Map frontend field names to backend field names"""
@@ -64,14 +72,19 @@ class FlipkartScraper:
         # Always include url and website_name
         return list(set(['url', 'website_name'] + mapped))
     
+    def _write_message(self, message):
+        """Write one JSON message line to the buffered stdout stream"""
+        self._out.write(_encode_message(message).encode('utf-8') + b'\n')
+    
     def send_progress(self, scraped, total):
-        """Send progress update to Node.js backend"""
+        """Send progress update to Node.js backend, flushing any buffered items"""
         progress_data = {
             "type": "progress",
             "scraped": scraped,
             "total": total
         }
-        print(json.dumps(progress_data), flush=True)
+        self._write_message(progress_data)
+        self._out.flush()
     
     def send_item(self, item, url, index):
         """Send scraped item to Node.js backend"""
@@ -81,7 +94,7 @@ class FlipkartScraper:
             "url": url,
             "index": index
         }
-        print(json.dumps(item_data), flush=True)
+        self._write_message(item_data)
     
     def send_error(self, message):
         """Send error message to stderr"""
@@ -118,14 +131,10 @@ class FlipkartScraper:
     def detect_captcha(self):
         """Detect CAPTCHA on the page"""
         try:
-            page_source = self.browser.page_source.lower()
-            captcha_indicators = ['captcha', 'verify you are not a robot', 'recaptcha', 'please verify']
-            if any(indicator in page_source for indicator in captcha_indicators):
-                return True
-            soup = BeautifulSoup(page_source, 'html.parser')
-            if soup.find('div', class_='g-recaptcha') or soup.find('form', id='challenge-form'):
+            page_source = self.browser.page_source
+            if _CAPTCHA_RE.search(page_source):
                 return True
-            if 'captcha' in self.browser.current_url.lower():
+            if _CAPTCHA_RE.search(self.browser.current_url):
                 return True
             return False
         except Exception as e:
@@ -4,19 +4,24 @@ IndiaMART Scraper - Integrated with Node.js Backend
 Modified to work with the backend scraper executor
 """
 
+import os
 import sys
 import json
 import re
 import time
+import queue
 import random
+import asyncio
 import logging
 import argparse
+import functools
+import subprocess
+import httpx
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import WebDriverException
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
 from webdriver_manager.chrome import ChromeDriverManager
 from urllib.parse import quote
 
@@ -45,15 +50,235 @@ FIELD_MAPPING = {
     'rating': 'feedback'
 }
 
+CURRENCY_SYMBOLS = frozenset("₹$€¥£")
+PLACEHOLDER_IMAGES = ('placeholder.png', 'default.jpg')
+
+BLOCKED_RESOURCE_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.webp', '*.gif', '*.svg',
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.mp4'
+]
+
+# Browsers used to render pages that could not be scraped from static HTML
+BROWSER_POOL_SIZE = 3
+
+# Serialized cards smaller than this are wrappers or stubs, not products
+MIN_CARD_BYTES = 200
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Resolved ChromeDriver path, reused while the installed Chrome major version is unchanged
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'scrapperly', 'chromedriver.json')
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser')
+
+# Shared encoder for the newline-delimited JSON messages sent to Node.js
+_encode_message = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+# Precompiled patterns used on every product card
+_RE_HTML_TAG = re.compile(r'<[^>]+>')
+_RE_TITLE_CLEAN = re.compile(r'[^\w\s,()&-]')
+_RE_TITLE_SPLIT = re.compile(r'[,|/]')
+_RE_PRICE_FULL = re.compile(r'(?:(?P<cur>[₹$€¥£]|[Rr][Ss]\.?)\s*)?(?P<num>\d[\d,]*(?:\.\d+)?)')
+_RE_QTY_UNIT = re.compile(r'(\d+)\s*([A-Za-z]+)')
+_RE_FLOAT = re.compile(r'([\d.]+)')
+_RE_CHROME_MAJOR = re.compile(r'(\d+)\.')
+
+# Card field selectors, compiled to XPath once instead of per card. Single-value
+# fields use one comma-joined selector so each is resolved in one tree walk.
+_SELECTORS = {
+    'title': CSSSelector(
+        'div.producttitle, div.titleAskPriceImageNavigation a, a.product-title, h2.product-name'
+    ),
+    'url': tuple(CSSSelector(s) for s in (
+        'div.titleAskPriceImageNavigation a',
+        'a.product-title',
+        'a.cardlinks',
+        'a[href]'
+    )),
+    'price': CSSSelector(
+        'p.price, div.price, span.price, div.mprice, span.mrp, *[class*="price"]'
+    ),
+    'description': CSSSelector('div.description, p.description, div.prod-desc'),
+    'min_order': CSSSelector('span.unit, div.moq, *[class*="moq"]'),
+    'supplier': CSSSelector('div.companyname a, div.companyname, p.company-name'),
+    'origin': CSSSelector('span.origin, div[class*="origin"]'),
+    'feedback': CSSSelector('div.rating, span.rating, *[class*="rating"]'),
+    'images': tuple(CSSSelector(s) for s in ('img[class*="product-img"]', 'img[src*="product"]', 'img[src]'))
+}
+
+# Product card selectors, tried in order against the parsed page
+CARD_SELECTORS = (
+    'div.card',
+    'div.product-card',
+    'div.listing',
+    'div[class*="product"]'
+)
+_CARD_SELECTORS = tuple(CSSSelector(s) for s in CARD_SELECTORS)
+
+# Runs the same ordered card lookup inside the browser and returns the matched
+# cards' outerHTML, so a rendered page costs one WebDriver round-trip per poll
+FIND_CARDS_SCRIPT = """
+const [selectors, minLength] = arguments;
+for (const selector of selectors) {
+    const cards = Array.from(document.querySelectorAll(selector), card => card.outerHTML)
+        .filter(html => html.length >= minLength);
+    if (cards.length) {
+        return [selector, cards];
+    }
+}
+return null;
+"""
+
+# Optionally scrolls one step, then reports how many cards are on the page; scrolling
+# and counting share a round-trip so lazy-load progress costs one call per check
+SCROLL_COUNT_SCRIPT = """
+const [selector, scroll] = arguments;
+if (scroll) {
+    window.scrollTo(0, Math.min(document.body.scrollHeight, window.scrollY + 800));
+}
+return document.querySelectorAll(selector).length;
+"""
+
+
+def _select_one(root, selector):
+    """Return the first element matched by a compiled selector"""
+    matches = selector(root)
+    return matches[0] if matches else None
+
+
+def _parse_page(html):
+    """Parse a listing page, dropping script/style subtrees no card selector can match"""
+    root = lxml_html.fromstring(html)
+    etree.strip_elements(root, 'script', 'style', 'noscript', with_tail=False)
+    return root
+
+
+def _match_cards(root):
+    """Return (card, card HTML) pairs for the first card selector that matches"""
+    for selector in _CARD_SELECTORS:
+        # Each card is serialized once, for the size check and for the extraction pool
+        product_cards = []
+        for card in selector(root):
+            card_html = lxml_html.tostring(card, encoding='unicode', with_tail=False)
+            if len(card_html) >= MIN_CARD_BYTES:
+                product_cards.append((card, card_html))
+        if product_cards:
+            logger.info(f"Found {len(product_cards)} products with selector: {selector.css}")
+            return product_cards
+    return []
+
+
+def _chrome_major_version():
+    """Return the installed Chrome major version, or None if it cannot be determined"""
+    for binary in CHROME_BINARIES:
+        try:
+            output = subprocess.run(
+                [binary, '--version'], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _RE_CHROME_MAJOR.search(output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _chromedriver_path():
+    """Return a ChromeDriver path, skipping ChromeDriverManager when the cached one still matches Chrome"""
+    chrome_major = _chrome_major_version()
+    try:
+        with open(DRIVER_CACHE_FILE) as f:
+            cached = json.load(f)
+        driver_path = cached.get('driver_path')
+        if chrome_major and cached.get('chrome_major') == chrome_major and driver_path and os.path.exists(driver_path):
+            return driver_path
+    except (OSError, ValueError):
+        pass
+    
+    driver_path = ChromeDriverManager().install()
+    if chrome_major:
+        try:
+            os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+            with open(DRIVER_CACHE_FILE, 'w') as f:
+                json.dump({'chrome_major': chrome_major, 'driver_path': driver_path}, f)
+        except OSError as e:
+            logger.warning(f"Could not cache ChromeDriver path: {str(e)}")
+    return driver_path
+
+
+def _text(el):
+    """Return the stripped text content of an lxml element"""
+    return ''.join(el.itertext()).strip()
+
+
+def _clean_text(text):
+    """Clean text by removing extra whitespace"""
+    if not text:
+        return None
+    text = _RE_HTML_TAG.sub('', text)
+    return ' '.join(text.strip().split())
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_title(title):
+    """Clean up product title; cached since listings repeat the same raw titles"""
+    if not title:
+        return None
+    title = _clean_text(title)
+    title = _RE_TITLE_CLEAN.sub('', title)
+    
+    # Remove duplicates
+    parts = _RE_TITLE_SPLIT.split(title)
+    unique_parts = {}
+    for part in parts:
+        part = part.strip()
+        if part:
+            unique_parts.setdefault(part.lower(), part)
+    
+    title = " ".join(unique_parts.values())
+    if len(title) > 100:
+        title = title[:97] + "..."
+    return title
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_price(price_text):
+    """Parse price text into a (currency, exact_price) tuple; cached for repeated price strings"""
+    if not price_text:
+        return None, None
+    
+    if "Ask Price" in price_text or "Call" in price_text:
+        return None, "Ask Price"
+    
+    price_match = _RE_PRICE_FULL.search(price_text)
+    if not price_match:
+        return None, None
+    
+    currency = price_match.group('cur')
+    if not currency:
+        # Symbol not adjacent to the number, e.g. "₹ / Piece 450"
+        currency = next((c for c in price_text if c in CURRENCY_SYMBOLS), None)
+    elif currency[0] in 'Rr':
+        currency = "₹"
+    return currency, price_match.group('num').replace(',', '')
+
 
 class IndiaMartScraper:
     def __init__(self, query, fields, max_items, job_id):
         self.query = query
         self.fields = self._map_fields(fields)
+        self._need_price = 'currency' in self.fields or 'exact_price' in self.fields
+        self._need_images = 'images' in self.fields or 'image_url' in self.fields
         self.max_items = max_items
         self.job_id = job_id
         self.scraped_count = 0
-        self.browser = None
+        self.scraped_urls = set()
+        self.browsers = []
+        self.idle_browsers = queue.Queue()
+        self.executor = None
+        self._out = sys.stdout.buffer
         
     def _map_fields(self, fields):
         """Map frontend field names to backend field names"""
@@ -63,16 +288,21 @@ class IndiaMartScraper:
             mapped_field = FIELD_MAPPING.get(field, field)
             mapped.append(mapped_field)
         # Always include url and website_name
-        return list(set(['url', 'website_name'] + mapped))
+        return frozenset(['url', 'website_name'] + mapped)
+    
+    def _write_message(self, message):
+        """Write one JSON message line to the buffered stdout stream"""
+        self._out.write(_encode_message(message).encode('utf-8') + b'\n')
     
     def send_progress(self, scraped, total):
-        """Send progress update to Node.js backend"""
+        """Send progress update to Node.js backend, flushing any buffered items"""
         progress_data = {
             "type": "progress",
             "scraped": scraped,
             "total": total
         }
-        print(json.dumps(progress_data), flush=True)
+        self._write_message(progress_data)
+        self._out.flush()
     
     def send_item(self, item, url, index):
         """Send scraped item to Node.js backend"""
@@ -82,7 +312,7 @@ class IndiaMartScraper:
             "url": url,
             "index": index
         }
-        print(json.dumps(item_data), flush=True)
+        self._write_message(item_data)
     
     def send_error(self, message):
         """Send error message to stderr"""
@@ -93,104 +323,54 @@ class IndiaMartScraper:
         print(json.dumps(error_data), file=sys.stderr, flush=True)
     
     def init_browser(self):
-        """Initialize Selenium browser"""
+        """Initialize and return a Selenium browser"""
         options = webdriver.ChromeOptions()
+        options.page_load_strategy = 'eager'
         options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
         options.add_argument("--ignore-certificate-errors")
         options.add_argument("--log-level=3")
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
-        options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        options.add_argument(f"user-agent={USER_AGENT}")
+        # Only the markup is scraped; skip downloading images, stylesheets and fonts
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.managed_default_content_settings.stylesheets': 2,
+            'profile.managed_default_content_settings.fonts': 2
+        })
         
         try:
-            self.browser = webdriver.Chrome(
-                service=webdriver.chrome.service.Service(ChromeDriverManager().install()),
+            browser = webdriver.Chrome(
+                service=webdriver.chrome.service.Service(_chromedriver_path()),
                 options=options
             )
-            self.browser.set_page_load_timeout(30)
-            self.browser.maximize_window()
+            browser.execute_cdp_cmd('Network.enable', {})
+            browser.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_URLS})
+            browser.set_page_load_timeout(30)
             logger.info("Chrome browser initialized successfully")
+            return browser
         except WebDriverException as e:
             raise Exception(f"Error initializing Chrome browser: {str(e)}")
     
-    def clean_text(self, text):
-        """Clean text by removing extra whitespace"""
-        if not text:
-            return None
-        text = re.sub(r'<[^>]+>', '', text)
-        return ' '.join(text.strip().split())
-    
-    def clean_title(self, title):
-        """Clean up product title"""
-        if not title:
-            return None
-        title = self.clean_text(title)
-        title = re.sub(r'[^\w\s,()&-]', '', title)
-        
-        # Remove duplicates
-        parts = re.split(r'[,|/]', title)
-        parts = [part.strip() for part in parts if part.strip()]
-        seen_phrases = set()
-        cleaned_parts = []
-        for part in parts:
-            part_lower = part.lower()
-            if part_lower not in seen_phrases:
-                seen_phrases.add(part_lower)
-                cleaned_parts.append(part)
-        
-        title = " ".join(cleaned_parts)
-        if len(title) > 100:
-            title = title[:97] + "..."
-        return title
-    
-    def parse_price(self, price_text):
-        """Parse price from text"""
-        if not price_text:
-            return {'currency': None, 'exact_price': None}
-        
-        if "Ask Price" in price_text or "Call" in price_text:
-            return {"currency": None, "exact_price": "Ask Price"}
-        
-        currency = None
-        currency_symbols = ["₹", "$", "€", "¥", "£", "Rs"]
-        for symbol in currency_symbols:
-            if symbol in price_text:
-                currency = symbol
-                break
-        if not currency and "rs" in price_text.lower():
-            currency = "₹"
-        
-        clean_text = re.sub(r'[^\d.,]', '', price_text)
-        price_pattern = r'(\d+(?:,\d{3})*(?:\.\d+)?)'
-        price_matches = re.findall(price_pattern, clean_text)
-        price_values = [re.sub(r'[^\d.]', '', p) for p in price_matches]
-        
-        if price_values:
-            return {"currency": currency, "exact_price": price_values[0]}
-        return {'currency': currency, 'exact_price': None}
-    
-    def retry_extraction(self, func, attempts=3, delay=1, default=None):
-        """Retry extraction with attempts"""
-        for i in range(attempts):
-            try:
-                result = func()
-                if result:
-                    return result
-            except Exception as e:
-                if i < attempts - 1:
-                    time.sleep(delay)
-        return default
-    
     def filter_product_data(self, product_data):
         """Filter product data to include only desired fields"""
         return {field: product_data[field] for field in self.fields if field in product_data}
     
-    def extract_product_data(self, card):
-        """Extract product data from a card element"""
+    def extract_url(self, card):
+        """Extract the normalized product URL from a parsed lxml card element"""
+        for selector in _SELECTORS['url']:
+            matches = selector(card)
+            if matches:
+                href = matches[0].get('href')
+                if href and ("indiamart.com" in href or href.startswith('/')):
+                    url = href if href.startswith('http') else f"https://www.indiamart.com{href}"
+                    return url.split('?')[0]
+        return None
+    
+    def extract_product_data(self, card, url=None):
+        """Extract product data from a parsed lxml card element"""
         product = {
             "url": None,
             "title": None,
@@ -211,145 +391,76 @@ class IndiaMartScraper:
         }
         
         try:
-            soup = BeautifulSoup(card.get_attribute('outerHTML'), 'html.parser')
-            
             # Title
             if 'title' in self.fields:
-                title_selectors = [
-                    'div.producttitle',
-                    'div.titleAskPriceImageNavigation a',
-                    'a.product-title',
-                    'h2.product-name'
-                ]
-                title_el = None
-                for selector in title_selectors:
-                    title_el = soup.select_one(selector)
-                    if title_el:
-                        break
-                if title_el:
-                    raw_title = self.retry_extraction(
-                        lambda: self.clean_text(title_el.get_text(strip=True))
-                    )
-                    product['title'] = self.clean_title(raw_title) if raw_title else None
+                title_el = _select_one(card, _SELECTORS['title'])
+                if title_el is not None:
+                    raw_title = _clean_text(_text(title_el))
+                    product['title'] = _clean_title(raw_title) if raw_title else None
                 
                 if not product['title']:
                     return None
             
             # URL
             if 'url' in self.fields:
-                url_selectors = [
-                    'div.titleAskPriceImageNavigation a',
-                    'a.product-title',
-                    'a.cardlinks',
-                    'a[href]'
-                ]
-                for selector in url_selectors:
-                    a_tag = soup.select_one(selector)
-                    if a_tag:
-                        href = self.retry_extraction(lambda: a_tag.get('href', None))
-                        if href and ("indiamart.com" in href or href.startswith('/')):
-                            product['url'] = href if href.startswith('http') else f"https://www.indiamart.com{href}"
-                            if product['url'] and '?' in product['url']:
-                                product['url'] = product['url'].split('?')[0]
-                            break
-                
+                product['url'] = url or self.extract_url(card)
                 if not product['url']:
                     return None
             
             # Price
-            if 'currency' in self.fields or 'exact_price' in self.fields:
-                price_selectors = [
-                    'p.price', 'div.price', 'span.price',
-                    'div.mprice', 'span.mrp', '*[class*="price"]'
-                ]
-                price_el = None
-                for selector in price_selectors:
-                    price_el = soup.select_one(selector)
-                    if price_el:
-                        break
-                if price_el:
-                    price_text = self.retry_extraction(lambda: price_el.get_text(strip=True))
-                    price_info = self.parse_price(price_text)
-                    product.update(price_info)
+            if self._need_price:
+                price_el = _select_one(card, _SELECTORS['price'])
+                if price_el is not None:
+                    price_text = _text(price_el)
+                    product['currency'], product['exact_price'] = _parse_price(price_text)
             
             # Description
             if 'description' in self.fields:
-                desc_selectors = ['div.description', 'p.description', 'div.prod-desc']
-                desc_el = None
-                for selector in desc_selectors:
-                    desc_el = soup.select_one(selector)
-                    if desc_el:
-                        break
-                product['description'] = self.retry_extraction(
-                    lambda: self.clean_text(desc_el.get_text(strip=True))[:500],
-                    default=None
-                )
+                desc_el = _select_one(card, _SELECTORS['description'])
+                if desc_el is not None:
+                    description = _clean_text(_text(desc_el))
+                    product['description'] = description[:500] if description else None
             
             # Min Order
             if 'min_order' in self.fields:
-                moq_selectors = ['span.unit', 'div.moq', '*[class*="moq"]']
-                moq_el = None
-                for selector in moq_selectors:
-                    moq_el = soup.select_one(selector)
-                    if moq_el:
-                        break
-                if moq_el:
-                    text = self.retry_extraction(lambda: self.clean_text(moq_el.get_text(strip=True)))
+                moq_el = _select_one(card, _SELECTORS['min_order'])
+                if moq_el is not None:
+                    text = _clean_text(_text(moq_el))
                     if text:
-                        qty_match = re.search(r'(\d+)', text)
-                        unit_match = re.search(r'([A-Za-z]+)', text)
-                        qty = qty_match.group(1) if qty_match else None
-                        unit = unit_match.group(1) if unit_match else None
-                        product['min_order'] = f"{qty} {unit}" if qty and unit else "1 unit"
+                        qty_unit_match = _RE_QTY_UNIT.search(text)
+                        if qty_unit_match:
+                            product['min_order'] = f"{qty_unit_match.group(1)} {qty_unit_match.group(2)}"
             
             # Supplier
             if 'supplier' in self.fields:
-                supplier_selectors = ['div.companyname a', 'div.companyname', 'p.company-name']
-                supplier_el = None
-                for selector in supplier_selectors:
-                    supplier_el = soup.select_one(selector)
-                    if supplier_el:
-                        break
-                product['supplier'] = self.retry_extraction(
-                    lambda: self.clean_text(supplier_el.get_text(strip=True)),
-                    default=None
-                )
+                supplier_el = _select_one(card, _SELECTORS['supplier'])
+                if supplier_el is not None:
+                    product['supplier'] = _clean_text(_text(supplier_el))
             
             # Origin
             if 'origin' in self.fields:
-                origin_selectors = ['span.origin', 'div[class*="origin"]']
-                origin_el = None
-                for selector in origin_selectors:
-                    origin_el = soup.select_one(selector)
-                    if origin_el:
-                        break
-                product['origin'] = self.retry_extraction(
-                    lambda: self.clean_text(origin_el.get_text(strip=True)),
-                    default=None
-                )
+                origin_el = _select_one(card, _SELECTORS['origin'])
+                if origin_el is not None:
+                    product['origin'] = _clean_text(_text(origin_el))
             
             # Feedback
             if 'feedback' in self.fields:
-                rating_el = soup.select_one('div.rating, span.rating, *[class*="rating"]')
-                if rating_el:
-                    rating_text = self.retry_extraction(lambda: rating_el.get_text(strip=True))
-                    rating_match = re.search(r'([\d.]+)', rating_text) if rating_text else None
+                rating_el = _select_one(card, _SELECTORS['feedback'])
+                if rating_el is not None:
+                    rating_text = _text(rating_el)
+                    rating_match = _RE_FLOAT.search(rating_text) if rating_text else None
                     product['feedback']['rating'] = rating_match.group(1) if rating_match else None
             
             # Images
-            if 'images' in self.fields or 'image_url' in self.fields:
-                img_selectors = ['img[class*="product-img"]', 'img[src*="product"]', 'img[src]']
+            if self._need_images:
                 images = []
                 image_url = None
-                for selector in img_selectors:
-                    img_elements = soup.select(selector)
+                for selector in _SELECTORS['images']:
+                    img_elements = selector(card)
                     if img_elements:
                         for idx, img in enumerate(img_elements):
-                            src = self.retry_extraction(
-                                lambda: img.get('src', '') or img.get('data-src', ''),
-                                default=''
-                            )
-                            if src and not src.startswith('data:') and not src.endswith(('placeholder.png', 'default.jpg')):
+                            src = img.get('src', '') or img.get('data-src', '')
+                            if src and not src.startswith('data:') and not src.endswith(PLACEHOLDER_IMAGES):
                                 if idx == 0:
                                     image_url = src
                                 images.append(src)
@@ -359,62 +470,124 @@ class IndiaMartScraper:
             
             return self.filter_product_data(product)
             
-        except (StaleElementReferenceException, Exception) as e:
+        except Exception as e:
             logger.error(f"Error extracting product data: {str(e)}")
             return None
     
-    def scrape_product_list_page(self, page_num):
-        """Scrape a single search results page"""
-        products = []
+    def find_product_cards(self, browser, timeout=10, poll=0.5):
+        """Poll the rendered page until a card selector matches, returning (card, card HTML) pairs"""
+        deadline = time.time() + timeout
+        while True:
+            found = browser.execute_script(FIND_CARDS_SCRIPT, CARD_SELECTORS, MIN_CARD_BYTES)
+            if found:
+                selector, outer_htmls = found
+                logger.info(f"Found {len(outer_htmls)} products with selector: {selector}")
+                return [(lxml_html.fromstring(outer_html), outer_html) for outer_html in outer_htmls]
+            if time.time() >= deadline:
+                return []
+            time.sleep(poll)
+    
+    def scroll_for_cards(self, browser, max_scrolls=3, timeout=2, poll=0.25):
+        """Scroll to trigger lazy loading, stopping as soon as the card count stops growing"""
+        selector = ', '.join(CARD_SELECTORS)
+        previous_count = browser.execute_script(SCROLL_COUNT_SCRIPT, selector, False)
+        for _ in range(max_scrolls):
+            deadline = time.time() + timeout
+            count = browser.execute_script(SCROLL_COUNT_SCRIPT, selector, True)
+            while count <= previous_count and time.time() < deadline:
+                time.sleep(poll)
+                count = browser.execute_script(SCROLL_COUNT_SCRIPT, selector, False)
+            if count <= previous_count:
+                break
+            previous_count = count
+    
+    def page_url(self, page_num):
+        """Build the search results URL for a page"""
+        return f"https://dir.indiamart.com/search.mp?ss={quote(self.query.replace(' ', '+'))}&page={page_num}"
+    
+    async def fetch_pages(self, page_nums):
+        """Fetch search results pages concurrently over plain HTTP"""
+        async with httpx.AsyncClient(
+            headers={'user-agent': USER_AGENT},
+            timeout=30,
+            follow_redirects=True
+        ) as client:
+            responses = await asyncio.gather(
+                *[client.get(self.page_url(page_num)) for page_num in page_nums],
+                return_exceptions=True
+            )
         
+        pages = {}
+        for page_num, response in zip(page_nums, responses):
+            if isinstance(response, Exception):
+                logger.warning(f"HTTP fetch failed for page {page_num}: {str(response)}")
+            elif response.status_code != 200:
+                logger.warning(f"HTTP fetch for page {page_num} returned status {response.status_code}")
+            else:
+                pages[page_num] = response.content
+        return pages
+    
+    def render_page(self, page_num):
+        """Load a search results page in a pooled browser and return its product cards"""
+        browser, ready_at = self.idle_browsers.get()
         try:
-            url = f"https://dir.indiamart.com/search.mp?ss={quote(self.query.replace(' ', '+'))}&page={page_num}"
-            logger.info(f"Scraping page {page_num}: {url}")
+            # Keep the randomized delay between consecutive loads on the same browser
+            time.sleep(max(0, ready_at - time.time()))
             
-            self.browser.get(url)
-            WebDriverWait(self.browser, 20).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
+            url = self.page_url(page_num)
+            logger.info(f"Rendering page {page_num} in browser: {url}")
             
-            # Scroll to load products
-            for _ in range(3):
-                self.browser.execute_script(
-                    "window.scrollTo(0, Math.min(document.body.scrollHeight, window.scrollY + 800));"
-                )
-                time.sleep(random.uniform(0.5, 1))
+            # With the eager load strategy this returns at DOMContentLoaded; readiness
+            # is decided by the card wait below rather than by third-party subresources
+            browser.get(url)
             
-            # Find product cards
-            product_cards_selectors = [
-                'div.card',
-                'div.product-card',
-                'div.listing',
-                'div[class*="product"]'
-            ]
-            product_cards = None
-            for selector in product_cards_selectors:
-                try:
-                    product_cards = WebDriverWait(self.browser, 10).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                    )
-                    if product_cards:
-                        logger.info(f"Found {len(product_cards)} products with selector: {selector}")
-                        break
-                except TimeoutException:
-                    continue
+            # Scroll to load products
+            self.scroll_for_cards(browser)
             
+            # Wait for product cards to appear and collect them in one round-trip
+            return self.find_product_cards(browser)
+        except Exception as e:
+            logger.error(f"Error rendering page {page_num}: {str(e)}")
+            return []
+        finally:
+            self.idle_browsers.put((browser, time.time() + random.uniform(2, 4)))
+    
+    def render_pages(self, page_nums):
+        """Render pages concurrently across a small pool of browsers"""
+        pool_size = min(BROWSER_POOL_SIZE, len(page_nums))
+        while len(self.browsers) < pool_size:
+            browser = self.init_browser()
+            self.browsers.append(browser)
+            self.idle_browsers.put((browser, 0))
+        
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            return dict(zip(page_nums, executor.map(self.render_page, page_nums)))
+    
+    def scrape_product_list_page(self, page_num, product_cards):
+        """Extract the new products from a search results page's cards"""
+        products = []
+        
+        try:
             if not product_cards:
                 logger.warning(f"No products found on page {page_num}")
                 return products
             
-            for card in product_cards:
-                if self.scraped_count >= self.max_items:
-                    break
-                
-                product = self.extract_product_data(card)
+            # Skip duplicates before paying for full field extraction
+            card_htmls = []
+            card_urls = []
+            for card, card_html in product_cards:
+                url = self.extract_url(card)
+                if not url or url in self.scraped_urls or url in card_urls:
+                    continue
+                card_htmls.append(card_html)
+                card_urls.append(url)
+            
+            # Extraction is pure CPU work, so fan it out across processes
+            results = self.executor.map(_extract_from_html, card_htmls, card_urls, chunksize=4)
+            for url, product in zip(card_urls, results):
                 if product:
+                    self.scraped_urls.add(url)
                     products.append(product)
-                
-                time.sleep(random.uniform(0.3, 0.7))
             
             return products
             
@@ -425,48 +598,60 @@ class IndiaMartScraper:
     def scrape(self):
         """Main scraping logic"""
         try:
-            self.init_browser()
-            
             # Calculate pages needed
             items_per_page = 30
             max_pages = min(10, (self.max_items // items_per_page) + 1)
+            page_nums = list(range(1, max_pages + 1))
             
             self.send_progress(0, self.max_items)
             
-            scraped_urls = set()
+            self.executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                initializer=_init_worker,
+                initargs=(self.fields,)
+            )
+            
+            try:
+                pages = asyncio.run(self.fetch_pages(page_nums))
+            except Exception as e:
+                logger.warning(f"HTTP fetch failed, falling back to browser: {str(e)}")
+                pages = {}
+            
+            page_cards = {}
+            for page_num in page_nums:
+                html = pages.get(page_num)
+                page_cards[page_num] = _match_cards(_parse_page(html)) if html else []
             
-            for page_num in range(1, max_pages + 1):
+            # Missing pages or JS challenges: fall back to real browsers
+            fallback_pages = [page_num for page_num in page_nums if not page_cards[page_num]]
+            if fallback_pages:
+                page_cards.update(self.render_pages(fallback_pages))
+            
+            for page_num in page_nums:
                 if self.scraped_count >= self.max_items:
                     break
                 
                 logger.info(f"Scraping page {page_num}")
-                products = self.scrape_product_list_page(page_num)
+                products = self.scrape_product_list_page(page_num, page_cards[page_num])
                 
                 for product in products:
                     if self.scraped_count >= self.max_items:
                         break
                     
-                    # Skip duplicates
-                    if product.get('url') in scraped_urls:
-                        continue
-                    
-                    scraped_urls.add(product.get('url'))
-                    
                     # Send item to backend
                     self.send_item(product, product.get('url', ''), self.scraped_count)
                     self.scraped_count += 1
                     self.send_progress(self.scraped_count, self.max_items)
-                
-                # Delay between pages
-                time.sleep(random.uniform(2, 4))
             
             logger.info(f"Scraping completed. Total items: {self.scraped_count}")
             
         except Exception as e:
             raise Exception(f"Fatal error during scraping: {str(e)}")
         finally:
-            if self.browser:
-                self.browser.quit()
+            if self.executor:
+                self.executor.shutdown()
+            for browser in self.browsers:
+                browser.quit()
     
     def run(self):
         """Execute scraping with error handling"""
@@ -478,6 +663,21 @@ class IndiaMartScraper:
             return 1
 
 
+# Per-process scraper used by the extraction pool workers
+_worker_scraper = None
+
+
+def _init_worker(fields):
+    """Build the scraper instance each pool worker extracts cards with"""
+    global _worker_scraper
+    _worker_scraper = IndiaMartScraper(query=None, fields=fields, max_items=0, job_id=None)
+
+
+def _extract_from_html(card_html, url):
+    """Extract product data from a card's serialized HTML inside a pool worker"""
+    return _worker_scraper.extract_product_data(lxml_html.fromstring(card_html), url)
+
+
 def main():
     """Parse arguments and run scraper"""
     parser = argparse.ArgumentParser(description='IndiaMART Scraper')
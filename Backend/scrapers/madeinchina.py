@@ -4,19 +4,28 @@ MadeinChina Scraper - Integrated with Node.js Backend
 Modified to work with the backend scraper executor
 """
 
+import re
 import time
 import json
 import os
 import sys
-import pickle
+import queue
+import asyncio
 import logging
 import argparse
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException
 
 # Configure logging
 logging.basicConfig(
@@ -40,15 +49,167 @@ FIELD_MAPPING = {
     'video_url': 'videos'
 }
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Browsers used to load product detail pages concurrently
+BROWSER_POOL_SIZE = 4
+
+# Product detail pages fetched at once over plain HTTP
+DETAIL_FETCH_CONCURRENCY = 8
+
+# Shared encoder for the newline-delimited JSON messages sent to Node.js; returns
+# UTF-8 bytes, using orjson's C encoder when it is installed
+if orjson is not None:
+    _encode_message = orjson.dumps
+    _decode_json = orjson.loads
+else:
+    _encode_json = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+    def _encode_message(message):
+        return _encode_json(message).encode('utf-8')
+
+    _decode_json = json.loads
+
+# Splits a card price into its leading currency marker and the price/range after it;
+# every group is optional, so it matches any text, including multi-line prices
+_RE_PRICE = re.compile(r'^\s*(?P<currency>[^\d.\-\s]*)\s*(?P<price>.*?)\s*$', re.DOTALL)
+
+# Marks the minimum order line on a listing card
+_RE_MOQ = re.compile(r'\(MOQ\)')
+
+# CAPTCHA markers; challenge pages are small, so only a bounded prefix is scanned
+_RE_CAPTCHA = re.compile(r'h-captcha|recaptcha|captcha-container|please verify', re.IGNORECASE)
+CAPTCHA_SCAN_CHARS = 65536
+
+# Card and detail-page selectors, compiled once instead of re-parsed for every card
+_SELECTORS = {
+    'link': sv.compile('a[href*="made-in-china.com"]'),
+    'title': sv.compile('.product-name, .sr-srpItem-title, .title'),
+    'price': sv.compile('.price, .price-info, .sr-srpItem-price'),
+    'supplier': sv.compile('.company-name, .supplier-name, .compnay-name span'),
+    'origin': sv.compile('.basic-info-list .bsc-item .bac-item-value'),
+    'rating': sv.compile('a.J-company-review .review-score'),
+    'stars': sv.compile('a.J-company-review .review-rate i'),
+    'spec_rows': sv.compile('div[class="basic-info-list"] > div[class="bsc-item cf"]'),
+    'spec_label': sv.compile('div[class*="bac-item-label"]'),
+    'spec_value': sv.compile('div[class*="bac-item-value"]'),
+    'info_list': sv.compile('.basic-info-list'),
+    'media_container': sv.compile('div.sr-proMainInfo-slide-container, div.product-media'),
+    'media_items': sv.compile(
+        'div:is(.sr-prMainInfo-slide-inner, .media-item) :is(script[type="text/data-video"], img)'
+    )
+}
+
+# Listing-card fields located together: one union query walks the card once and
+# each match is assigned to every field whose own selector it satisfies
+_CARD_FIELDS = ('link', 'title', 'price', 'supplier')
+_CARD_UNION = sv.compile(', '.join(_SELECTORS[name].pattern for name in _CARD_FIELDS))
+
+
+def _match_card_fields(card):
+    """Return the first element in document order for each listing-card field"""
+    matches = {}
+    for tag in _CARD_UNION.select(card):
+        for name in _CARD_FIELDS:
+            if name not in matches and _SELECTORS[name].match(tag):
+                matches[name] = tag
+        if len(matches) == len(_CARD_FIELDS):
+            break
+    return matches
+
+
+def _extract_title(card, card_fields, product_data):
+    """Fill the title from a listing card"""
+    title_elem = card_fields.get('title')
+    if title_elem:
+        product_data["title"] = title_elem.get_text(strip=True)
+
+
+def _extract_price(card, card_fields, product_data):
+    """Fill currency and price from a listing card"""
+    price_elem = card_fields.get('price')
+    if price_elem:
+        price_match = _RE_PRICE.match(price_elem.get_text(strip=True))
+        product_data["currency"] = price_match.group('currency')
+        product_data["exact_price"] = price_match.group('price')
+
+
+def _extract_min_order(card, card_fields, product_data):
+    """Fill the minimum order from a listing card"""
+    min_order_elem = card.find('div', string=_RE_MOQ)
+    if min_order_elem:
+        min_order_text = min_order_elem.get_text(strip=True)
+        product_data["min_order"] = min_order_text.replace('(MOQ)', '').strip()
+
+
+def _extract_supplier(card, card_fields, product_data):
+    """Fill the supplier from a listing card"""
+    supplier_elem = card_fields.get('supplier')
+    if supplier_elem:
+        product_data["supplier"] = supplier_elem.get_text(strip=True)
+
+
+# Listing-card extractors by output field; fields sharing an extractor run it once
+_LIST_EXTRACTORS = {
+    'title': _extract_title,
+    'currency': _extract_price,
+    'exact_price': _extract_price,
+    'min_order': _extract_min_order,
+    'supplier': _extract_supplier
+}
+
+
+# Detail-page blocks that are read (spec table, review link, media gallery); only
+# these subtrees are built when a product page is parsed
+DETAIL_STRAINER = SoupStrainer(class_=[
+    'basic-info-list',
+    'J-company-review',
+    'sr-proMainInfo-slide-container',
+    'product-media'
+])
+
+# Alternative product list containers, queried as one union selector
+PRODUCT_CONTAINER_SELECTOR = ', '.join([
+    '.sr-srpList',
+    '.prod-list',
+    '.search-result-list',
+    'div[data-component="ProductList"]'
+])
+
+# Any detail block that is read; its presence means the page markup has arrived
+DETAIL_READY_SELECTOR = ', '.join([
+    '.basic-info-list',
+    '.sr-proMainInfo-slide-container',
+    '.product-media',
+    '.captcha-container'
+])
+
 class MadeinChinaScraper:
     def __init__(self, query, fields, max_items, job_id):
         self.query = query
         self.fields = self._map_fields(fields)
+        # Field membership is fixed for the run; resolve the per-product checks once
+        self._list_extractors = list(dict.fromkeys(
+            extract for field, extract in _LIST_EXTRACTORS.items() if field in self.fields
+        ))
+        self._need_origin = 'origin' in self.fields
+        self._need_feedback = 'feedback' in self.fields
+        self._need_specs = 'specifications' in self.fields
+        self._need_images = 'images' in self.fields
+        self._need_videos = 'videos' in self.fields
+        self._need_media = self._need_images or self._need_videos
+        self._need_detail = self._need_origin or self._need_feedback or self._need_specs or self._need_media
+        # Reviews and the media gallery are rendered by scripts; only origin and specs are
+        # in the server HTML, so anything else sends detail pages to the browsers
+        self._need_browser = self._need_feedback or self._need_media
         self.max_items = max_items
         self.job_id = job_id
         self.scraped_count = 0
         self.browser = None
-        self.session_id = f"madeinchina_{job_id}_{int(time.time())}"
+        self.detail_browsers = []
+        self.idle_browsers = queue.Queue()
+        self.scraped_urls = set()
+        self._out = sys.stdout.buffer
         
     def _map_fields(self, fields):
         """Map frontend field names to backend field names"""
@@ -58,16 +219,21 @@ class MadeinChinaScraper:
             mapped_field = FIELD_MAPPING.get(field, field)
             mapped.append(mapped_field)
         # Always include url and website_name
-        return list(set(['url', 'website_name'] + mapped))
+        return frozenset(['url', 'website_name'] + mapped)
+    
+    def _write_message(self, message):
+        """Write one JSON message line to the buffered stdout stream"""
+        self._out.write(_encode_message(message) + b'\n')
     
     def send_progress(self, scraped, total):
-        """Send progress update to Node.js backend"""
+        """Send progress update to Node.js backend, flushing any buffered items"""
         progress_data = {
             "type": "progress",
             "scraped": scraped,
             "total": total
         }
-        print(json.dumps(progress_data), flush=True)
+        self._write_message(progress_data)
+        self._out.flush()
     
     def send_item(self, item, url, index):
         """Send scraped item to Node.js backend"""
@@ -77,7 +243,7 @@ class MadeinChinaScraper:
             "url": url,
             "index": index
         }
-        print(json.dumps(item_data), flush=True)
+        self._write_message(item_data)
     
     def send_error(self, message):
         """Send error message to stderr"""
@@ -88,29 +254,44 @@ class MadeinChinaScraper:
         print(json.dumps(error_data), file=sys.stderr, flush=True)
     
     def init_browser(self):
-        """Initialize Selenium browser"""
+        """Initialize and return a Selenium browser"""
         options = webdriver.FirefoxOptions()
         options.add_argument("--headless")
         options.add_argument("--ignore-certificate-errors")
         options.add_argument("--log-level=3")
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        options.add_argument(f"user-agent={USER_AGENT}")
+        # Only markup is scraped; image URLs are read from src attributes, so skip
+        # downloading image bytes and web fonts
+        options.set_preference("permissions.default.image", 2)
+        options.set_preference("browser.display.use_document_fonts", 0)
+        options.set_preference("gfx.downloadable_fonts.enabled", False)
+        options.set_preference("media.autoplay.default", 5)
+        # Return from get() at DOMContentLoaded; readiness is checked per page by selector
+        options.page_load_strategy = 'eager'
         
         try:
-            self.browser = webdriver.Firefox(options=options)
+            browser = webdriver.Firefox(options=options)
             logging.info("Browser initialized successfully")
+            return browser
         except Exception as e:
             raise Exception(f"Error initializing Firefox browser: {str(e)}")
     
-    def detect_captcha(self):
-        """Detect CAPTCHA on the page"""
+    def wait_for_selector(self, browser, selector, timeout=10):
+        """Wait until an element matching the CSS selector is present, without raising on timeout"""
         try:
-            page_source = self.browser.page_source
-            if any(keyword in page_source.lower() for keyword in ['h-captcha', 'recaptcha', 'please verify']):
-                return True
-            soup = BeautifulSoup(page_source, 'html.parser')
-            if soup.find('div', class_='captcha-container'):
+            WebDriverWait(browser, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def detect_captcha(self, page_source, url):
+        """Detect CAPTCHA in a page that has already been read"""
+        try:
+            if _RE_CAPTCHA.search(page_source, 0, CAPTCHA_SCAN_CHARS):
                 return True
-            if 'captcha' in self.browser.current_url.lower():
+            if 'captcha' in url.lower():
                 return True
             return False
         except Exception as e:
@@ -119,11 +300,8 @@ class MadeinChinaScraper:
     
     def filter_product_data(self, product_data):
         """Filter product data to include only desired fields"""
-        filtered_data = {}
-        for field in self.fields:
-            if field in product_data:
-                filtered_data[field] = product_data[field]
-        return filtered_data
+        # Iterate the product so output keys keep the template's order
+        return {field: value for field, value in product_data.items() if field in self.fields}
     
     def scrape_product_list_page(self, page_num):
         """Scrape a single search results page"""
@@ -132,228 +310,251 @@ class MadeinChinaScraper:
         try:
             search_url = f'https://www.made-in-china.com/multi-search/{self.query}/F1/{page_num}.html'
             self.browser.get(search_url)
-            WebDriverWait(self.browser, 10).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
+            # A CAPTCHA page has no product list; it is caught by the check below
+            self.wait_for_selector(self.browser, f"{PRODUCT_CONTAINER_SELECTOR}, .captcha-container")
             
-            # Check for CAPTCHA
-            if self.detect_captcha():
+            # Check for CAPTCHA before parsing the cards
+            page_source = self.browser.page_source
+            if self.detect_captcha(page_source, self.browser.current_url):
                 self.send_error("CAPTCHA detected - manual intervention required")
-                return products
+                return []
             
-            # Find product container
-            product_cards_container = None
-            selectors = [
-                '.sr-srpList',
-                '.prod-list',
-                '.search-result-list',
-                'div[data-component="ProductList"]'
-            ]
-            
-            for selector in selectors:
-                try:
-                    product_cards_container = self.browser.find_element(By.CSS_SELECTOR, selector)
-                    logging.info(f"Found product container with selector: {selector}")
-                    break
-                except NoSuchElementException:
-                    continue
+            page_soup = BeautifulSoup(page_source, "lxml")
             
+            # Find product container with a single lookup
+            product_cards_container = page_soup.select_one(PRODUCT_CONTAINER_SELECTOR)
             if not product_cards_container:
                 logging.warning(f"No product container found on page {page_num}")
-                return products
+                return []
             
             # Parse product cards
-            product_cards_html = BeautifulSoup(
-                product_cards_container.get_attribute("outerHTML"),
-                "html.parser"
-            )
-            product_cards = product_cards_html.find_all(
+            product_cards = product_cards_container.find_all(
                 "div",
                 {"class": ["sr-srpItem", "prod-info", "item"]}
             )
             
             if not product_cards:
                 logging.warning(f"No product cards found on page {page_num}")
-                return products
+                return []
             
+            # Collect listing fields first, skipping products already seen
+            remaining = self.max_items - self.scraped_count
             for product in product_cards:
-                if self.scraped_count >= self.max_items:
+                if len(products) >= remaining:
                     break
-                    
+                
                 product_data = self.scrape_product_card(product)
                 if product_data:
                     products.append(product_data)
             
-            return products
+            # Then visit the detail pages concurrently
+            if products and self._need_detail:
+                self.scrape_product_pages(products)
             
         except Exception as e:
             logging.error(f"Error scraping page {page_num}: {str(e)}")
-            return products
+        
+        return [self.filter_product_data(product_data) for product_data in products]
     
     def scrape_product_card(self, product):
-        """Extract data from a product card"""
-        product_json_data = {
-            "url": "",
-            "title": "",
-            "currency": "",
-            "exact_price": "",
-            "min_order": "",
-            "supplier": "",
-            "origin": "",
-            "feedback": {"rating": "", "star_count": ""},
-            "specifications": {},
-            "images": [],
-            "videos": [],
-            "website_name": "MadeinChina",
-            "discount_information": "N/A",
-            "brand_name": "N/A"
-        }
-        
+        """Extract the listing fields from a product card, or None for a duplicate or linkless card"""
         try:
-            # Extract product URL
-            if 'url' in self.fields:
-                product_link = product.select_one('a[href*="made-in-china.com"]')
-                if product_link:
-                    product_url = product_link.get('href')
-                    product_url = 'https:' + product_url if product_url.startswith('//') else product_url
-                    product_json_data["url"] = product_url
+            card_fields = _match_card_fields(product)
             
-            if not product_json_data["url"]:
+            # Resolve the product URL first so duplicates are dropped before any parsing
+            product_link = card_fields.get('link')
+            product_url = product_link.get('href') if product_link else None
+            if not product_url:
                 return None
+            product_url = 'https:' + product_url if product_url.startswith('//') else product_url
+            if product_url in self.scraped_urls:
+                return None
+            self.scraped_urls.add(product_url)
             
-            # Extract product title
-            if 'title' in self.fields:
-                title_elem = product.select_one('.product-name, .sr-srpItem-title, .title')
-                if title_elem:
-                    product_json_data["title"] = title_elem.get_text(strip=True)
-            
-            # Extract currency and price
-            if 'currency' in self.fields or 'exact_price' in self.fields:
-                price_elem = product.select_one('.price, .price-info, .sr-srpItem-price')
-                if price_elem:
-                    currency_price_text = price_elem.get_text(strip=True)
-                    currency = ''.join([c for c in currency_price_text if not c.isdigit() and c not in ['.', '-', ' ']]).strip()
-                    product_json_data["currency"] = currency
-                    price_range = currency_price_text.replace(currency, '').strip()
-                    product_json_data["exact_price"] = price_range
-            
-            # Extract minimum order
-            if 'min_order' in self.fields:
-                min_order_elem = product.find('div', string=lambda t: t and '(MOQ)' in t)
-                if min_order_elem:
-                    min_order_text = min_order_elem.get_text(strip=True)
-                    product_json_data["min_order"] = min_order_text.replace('(MOQ)', '').strip()
-            
-            # Extract supplier
-            if 'supplier' in self.fields:
-                supplier_elem = product.select_one('.company-name, .supplier-name, .compnay-name span')
-                if supplier_elem:
-                    product_json_data["supplier"] = supplier_elem.get_text(strip=True)
+            product_json_data = {
+                "url": product_url,
+                "title": "",
+                "currency": "",
+                "exact_price": "",
+                "min_order": "",
+                "supplier": "",
+                "origin": "",
+                "feedback": {"rating": "", "star_count": ""},
+                "specifications": {},
+                "images": [],
+                "videos": [],
+                "website_name": "MadeinChina",
+                "discount_information": "N/A",
+                "brand_name": "N/A"
+            }
             
-            # Scrape product page details if needed
-            if any(field in self.fields for field in ['origin', 'feedback', 'specifications', 'images', 'videos']):
-                self.scrape_product_page_details(product_json_data)
+            # Run only the extractors for the requested listing fields
+            for extract in self._list_extractors:
+                extract(product, card_fields, product_json_data)
             
-            return self.filter_product_data(product_json_data)
+            return product_json_data
             
         except Exception as e:
             logging.error(f"Error scraping product card: {str(e)}")
             return None
     
-    def scrape_product_page_details(self, product_data):
-        """Visit product page and extract detailed information"""
-        try:
-            self.browser.get(product_data["url"])
-            WebDriverWait(self.browser, 10).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            
-            if self.detect_captcha():
-                self.send_error("CAPTCHA detected on product page")
-                return
-            
-            self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
-            product_page_html = BeautifulSoup(self.browser.page_source, "html.parser")
+    async def fetch_detail_pages(self, urls, cookies):
+        """Fetch product detail pages concurrently over plain HTTP"""
+        semaphore = asyncio.Semaphore(DETAIL_FETCH_CONCURRENCY)
+        async with httpx.AsyncClient(
+            headers={'user-agent': USER_AGENT},
+            cookies=cookies,
+            timeout=30,
+            follow_redirects=True
+        ) as client:
+            async def fetch(url):
+                async with semaphore:
+                    return await client.get(url)
             
-            # Extract origin
-            if 'origin' in self.fields:
+            responses = await asyncio.gather(*[fetch(url) for url in urls], return_exceptions=True)
+        
+        pages = {}
+        for url, response in zip(urls, responses):
+            if isinstance(response, Exception):
+                logging.warning(f"HTTP fetch failed for {url}: {str(response)}")
+            elif response.status_code != 200:
+                logging.warning(f"HTTP fetch for {url} returned status {response.status_code}")
+            else:
+                pages[url] = (response.text, str(response.url))
+        return pages
+    
+    def scrape_product_pages(self, products):
+        """Scrape product detail pages, over HTTP where possible and in pooled browsers otherwise"""
+        pending = products
+        
+        if not self._need_browser:
+            cookies = {cookie['name']: cookie['value'] for cookie in self.browser.get_cookies()}
+            try:
+                pages = asyncio.run(self.fetch_detail_pages([product_data["url"] for product_data in products], cookies))
+            except Exception as e:
+                logging.warning(f"HTTP fetch failed, falling back to browsers: {str(e)}")
+                pages = {}
+            pending = []
+            for product_data in products:
+                page = pages.get(product_data["url"])
                 try:
-                    origin_elem = product_page_html.select_one('.basic-info-list .bsc-item .bac-item-value')
-                    if origin_elem:
-                        product_data["origin"] = origin_elem.get_text(strip=True)
+                    if page and self.extract_product_page_details(product_data, *page, require_content=True):
+                        continue
                 except Exception as e:
-                    logging.error(f"Error extracting origin: {str(e)}")
-            
-            # Extract feedback
-            if 'feedback' in self.fields:
-                try:
-                    rating_elem = self.browser.find_element(By.CSS_SELECTOR, "a.J-company-review .review-score")
-                    product_data["feedback"]["rating"] = rating_elem.text if rating_elem else "No rating"
-                    
-                    star_elems = self.browser.find_elements(By.CSS_SELECTOR, "a.J-company-review .review-rate i")
-                    product_data["feedback"]["star_count"] = str(len(star_elems))
-                except Exception:
-                    product_data["feedback"]["rating"] = "No rating"
-                    product_data["feedback"]["star_count"] = "0"
+                    logging.error(f"Error scraping product page {product_data['url']}: {str(e)}")
+                pending.append(product_data)
+            if pending:
+                logging.info(f"Falling back to browsers for {len(pending)} product pages")
+        
+        if not pending:
+            return
+        
+        pool_size = min(BROWSER_POOL_SIZE, len(pending))
+        while len(self.detail_browsers) < pool_size:
+            browser = self.init_browser()
+            self.detail_browsers.append(browser)
+            self.idle_browsers.put(browser)
+        
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            list(executor.map(self.scrape_product_page_details, pending))
+    
+    def scrape_product_page_details(self, product_data):
+        """Visit product page in a pooled browser and extract detailed information"""
+        browser = self.idle_browsers.get()
+        try:
+            browser.get(product_data["url"])
+            self.wait_for_selector(browser, DETAIL_READY_SELECTOR)
             
-            # Extract specifications
-            if 'specifications' in self.fields:
-                specs = {}
-                try:
-                    rows = self.browser.find_elements(By.XPATH, "//div[@class='basic-info-list']/div[@class='bsc-item cf']")
-                    for row in rows:
-                        try:
-                            label_div = row.find_element(By.XPATH, ".//div[contains(@class,'bac-item-label')]")
-                            value_div = row.find_element(By.XPATH, ".//div[contains(@class,'bac-item-value')]")
-                            label = label_div.text.strip()
-                            value = value_div.text.strip()
-                            if label and value:
-                                specs[label] = value
-                        except Exception:
-                            continue
-                    product_data["specifications"] = specs
-                except Exception as e:
-                    logging.error(f"Error extracting specifications: {str(e)}")
+            # Only the media gallery is lazy-loaded; scroll for it before reading the page
+            if self._need_media:
+                browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(1)
             
-            # Extract images and videos
-            if 'images' in self.fields or 'videos' in self.fields:
-                try:
-                    swiper = product_page_html.find("div", {"class": ["sr-proMainInfo-slide-container", "product-media"]})
-                    if swiper:
-                        wrapper = swiper.find("div", {"class": "swiper-wrapper"})
-                        if wrapper:
-                            media_blocks = wrapper.find_all("div", {"class": ["sr-prMainInfo-slide-inner", "media-item"]})
-                            for media in media_blocks:
-                                if 'videos' in self.fields:
-                                    videos = media.find_all("script", {"type": "text/data-video"})
-                                    for vid in videos:
-                                        try:
-                                            video_data = json.loads(vid.get_text(strip=True))
-                                            video_url = video_data.get("videoUrl")
-                                            if video_url:
-                                                product_data["videos"].append(video_url)
-                                        except:
-                                            continue
-                                
-                                if 'images' in self.fields:
-                                    images = media.find_all("img")
-                                    for img in images:
-                                        src = img.get("src", "")
-                                        if src.startswith("//"):
-                                            src = "https:" + src
-                                        if src:
-                                            product_data["images"].append(src)
-                except Exception as e:
-                    logging.error(f"Error extracting media: {str(e)}")
-                    
+            if not self.extract_product_page_details(product_data, browser.page_source, browser.current_url):
+                self.send_error("CAPTCHA detected on product page")
+                
         except Exception as e:
             logging.error(f"Error scraping product page {product_data['url']}: {str(e)}")
+        finally:
+            self.idle_browsers.put(browser)
+    
+    def extract_product_page_details(self, product_data, page_source, url, require_content=False):
+        """Extract detail fields from a product page's HTML, returning False on a CAPTCHA page or missing required content"""
+        if self.detect_captcha(page_source, url):
+            return False
+        product_page_html = BeautifulSoup(page_source, "lxml", parse_only=DETAIL_STRAINER)
+        if require_content and not _SELECTORS['info_list'].select_one(product_page_html):
+            return False
+        
+        # Extract origin
+        if self._need_origin:
+            try:
+                origin_elem = _SELECTORS['origin'].select_one(product_page_html)
+                if origin_elem:
+                    product_data["origin"] = origin_elem.get_text(strip=True)
+            except Exception as e:
+                logging.error(f"Error extracting origin: {str(e)}")
+        
+        # Extract feedback
+        if self._need_feedback:
+            rating_elem = _SELECTORS['rating'].select_one(product_page_html)
+            if rating_elem:
+                product_data["feedback"]["rating"] = rating_elem.get_text(strip=True)
+                star_elems = _SELECTORS['stars'].select(product_page_html)
+                product_data["feedback"]["star_count"] = str(len(star_elems))
+            else:
+                product_data["feedback"]["rating"] = "No rating"
+                product_data["feedback"]["star_count"] = "0"
+        
+        # Extract specifications
+        if self._need_specs:
+            specs = {}
+            try:
+                rows = _SELECTORS['spec_rows'].select(product_page_html)
+                for row in rows:
+                    label_div = _SELECTORS['spec_label'].select_one(row)
+                    value_div = _SELECTORS['spec_value'].select_one(row)
+                    if not label_div or not value_div:
+                        continue
+                    label = label_div.get_text(strip=True)
+                    value = value_div.get_text(strip=True)
+                    if label and value:
+                        specs[label] = value
+                product_data["specifications"] = specs
+            except Exception as e:
+                logging.error(f"Error extracting specifications: {str(e)}")
+        
+        # Extract images and videos
+        if self._need_media:
+            try:
+                swiper = _SELECTORS['media_container'].select_one(product_page_html)
+                wrapper = swiper.find("div", {"class": "swiper-wrapper"}) if swiper else None
+                if wrapper:
+                    # Video scripts and images of every media block, in one document-order pass
+                    for tag in _SELECTORS['media_items'].select(wrapper):
+                        if tag.name == "script":
+                            if self._need_videos:
+                                try:
+                                    video_url = _decode_json(tag.get_text(strip=True)).get("videoUrl")
+                                    if video_url:
+                                        product_data["videos"].append(video_url)
+                                except Exception:
+                                    continue
+                        elif self._need_images:
+                            src = tag.get("src", "")
+                            if src.startswith("//"):
+                                src = "https:" + src
+                            if src:
+                                product_data["images"].append(src)
+            except Exception as e:
+                logging.error(f"Error extracting media: {str(e)}")
+        
+        return True
     
     def scrape(self):
         """Main scraping logic"""
         try:
-            self.init_browser()
+            self.browser = self.init_browser()
             
             # Calculate how many pages we need to scrape
             items_per_page = 20  # Approximate
@@ -361,8 +562,6 @@ class MadeinChinaScraper:
             
             self.send_progress(0, self.max_items)
             
-            scraped_urls = set()
-            
             for page_num in range(1, max_pages + 1):
                 if self.scraped_count >= self.max_items:
                     break
@@ -374,12 +573,6 @@ class MadeinChinaScraper:
                     if self.scraped_count >= self.max_items:
                         break
                     
-                    # Skip duplicates
-                    if product.get('url') in scraped_urls:
-                        continue
-                    
-                    scraped_urls.add(product.get('url'))
-                    
                     # Send item to backend
                     self.send_item(product, product.get('url', ''), self.scraped_count)
                     self.scraped_count += 1
@@ -395,6 +588,11 @@ class MadeinChinaScraper:
         finally:
             if self.browser:
                 self.browser.quit()
+            for browser in self.detail_browsers:
+                try:
+                    browser.quit()
+                except Exception:
+                    pass
     
     def run(self):
         """Execute scraping with error handling"""